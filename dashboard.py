@@ -7,7 +7,14 @@ import os
 import sys
 import json
 import logging
-from flask import Flask, jsonify, send_from_directory
+import time
+import threading
+from flask import Flask, Response, jsonify, request, send_from_directory
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
 
 # Setup logging
 logging.basicConfig(
@@ -19,10 +26,30 @@ logger = logging.getLogger(__name__)
 # Initialize Flask app
 app = Flask(__name__, static_folder='dashboard')
 
+# index.html loads style.css and app.js by fixed, unversioned URLs, so
+# static files are sent with Cache-Control: no-cache. Browsers keep their
+# copy but revalidate it on each load, and send_from_directory answers
+# unchanged files with 304 Not Modified (ETag / If-Modified-Since).
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = None
+
 # Configuration paths
 CONFIG_PATH = os.path.join('config', 'config.json')
 ALERTS_LOG = os.path.join('alerts', 'alerts.log')
 
+# Serialized /api/alerts payload, reused until alerts.log changes
+_alerts_cache = {'key': None, 'body': None}
+_alerts_cache_lock = threading.Lock()
+
+# Live alert stream: how often each client checks alerts.log for new data,
+# and how often an idle stream sends a keep-alive comment
+STREAM_POLL_INTERVAL = 1.0
+STREAM_KEEPALIVE_INTERVAL = 15.0
+
+# Open alert streams; each one occupies a server thread, so they are capped
+# (dashboard.max_streams) and extra clients fall back to polling
+_streams = {'active': 0, 'limit': 8}
+_streams_lock = threading.Lock()
+
 
 def load_dashboard_config():
     """
@@ -30,13 +57,16 @@ def load_dashboard_config():
     Environment variables take precedence over config file.
     
     Returns:
-        dict: Dashboard configuration with host, port, and debug settings
+        dict: Dashboard configuration with host, port, debug, threads and
+            max_streams settings
     """
     # Default configuration
     config = {
         'host': '127.0.0.1',
         'port': 5000,
-        'debug': False
+        'debug': False,
+        'threads': 16,
+        'max_streams': 8
     }
     
     # Try to load from config file
@@ -52,6 +82,8 @@ def load_dashboard_config():
     # Environment variables override config file
     config['host'] = os.environ.get('FLASK_HOST', config['host'])
     config['port'] = int(os.environ.get('FLASK_PORT', config['port']))
+    config['threads'] = int(config['threads'])
+    config['max_streams'] = int(config['max_streams'])
     
     # Check for debug mode from environment (common Flask practice)
     flask_debug = os.environ.get('FLASK_DEBUG', '').lower()
@@ -63,26 +95,157 @@ def load_dashboard_config():
     return config
 
 
+def split_alert_lines(data, offset=0):
+    """
+    Split raw alerts.log data into alert lines. Shared by /api/alerts and
+    the alert stream so both return identical strings for the same record,
+    which the dashboard relies on to de-duplicate alerts.
+    Only newlines end a record: the monitor copies log lines verbatim, and
+    they may contain other characters str.splitlines() would split on.
+    
+    Args:
+        data (bytes): alerts.log contents; an unterminated last line is ignored
+        offset (int): Byte offset in alerts.log where data starts
+        
+    Returns:
+        list: (offset just past the line, line) tuples for non-empty lines
+    """
+    lines = []
+    for raw in data.split(b'\n')[:-1]:
+        offset += len(raw) + 1
+        # A bare CR is a line break in an event stream and would cut the
+        # alert short, so embedded ones are shown as spaces
+        line = raw.rstrip(b'\r').replace(b'\r', b' ').decode('utf-8', errors='ignore')
+        if line:  # Skip empty lines
+            lines.append((offset, line))
+    return lines
+
+
 # API endpoint to get all alerts
 @app.route('/api/alerts')
 def get_alerts():
     """
     Reads alerts from the alerts log file and returns them as a JSON list.
+    The response is cached until the log's mtime or size changes, and its
+    ETag lets polling clients revalidate without re-downloading it.
+    The returned offset is where /api/alerts/stream should continue from.
     """
-    alerts = []
     try:
-        if os.path.exists(ALERTS_LOG):
-            with open(ALERTS_LOG, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:  # Skip empty lines
-                        alerts.append(line)
-        return jsonify({'alerts': alerts, 'count': len(alerts)})
+        try:
+            stat_info = os.stat(ALERTS_LOG)
+            cache_key = (stat_info.st_mtime_ns, stat_info.st_size)
+        except FileNotFoundError:
+            cache_key = (0, 0)
+        
+        with _alerts_cache_lock:
+            if _alerts_cache['key'] != cache_key:
+                data = b''
+                if os.path.exists(ALERTS_LOG):
+                    with open(ALERTS_LOG, 'rb') as f:
+                        data = f.read()
+                # Leave a partially flushed last line to the stream
+                data = data[:data.rfind(b'\n') + 1]
+                alerts = [line for _, line in split_alert_lines(data)]
+                _alerts_cache['body'] = app.json.dumps({
+                    'alerts': alerts,
+                    'count': len(alerts),
+                    'offset': len(data)
+                })
+                _alerts_cache['key'] = cache_key
+            body = _alerts_cache['body']
+        
+        response = app.response_class(body, mimetype='application/json')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.set_etag(f"{cache_key[0]}-{cache_key[1]}")
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Error reading alerts log: {e}")
         return jsonify({'error': 'Failed to read alerts', 'alerts': [], 'count': 0}), 500
 
 
+def follow_alerts(offset, client_disconnected=None):
+    """
+    Yield alerts appended to the alerts log after a byte offset, formatted
+    as Server-Sent Events. Each event id is the offset just past its line,
+    so a reconnecting browser resumes exactly where it left off.
+    
+    Args:
+        offset (int): Byte offset in alerts.log to start from
+        client_disconnected (callable): Returns True once the client has
+            gone away, so the stream's worker thread is released without
+            waiting for a write to fail (waitress provides this)
+    """
+    last_sent = time.monotonic()
+    while True:
+        if client_disconnected is not None and client_disconnected():
+            return
+        
+        try:
+            size = os.path.getsize(ALERTS_LOG)
+        except OSError:
+            size = 0
+        
+        if size < offset:
+            # alerts.log was truncated or replaced, start over
+            offset = 0
+        
+        if size > offset:
+            with open(ALERTS_LOG, 'rb') as f:
+                f.seek(offset)
+                data = f.read(size - offset)
+            
+            # Only send complete lines; a partial one is picked up next time
+            for end, line in split_alert_lines(data, offset):
+                yield f"id: {end}\ndata: {line}\n\n"
+                last_sent = time.monotonic()
+            offset += data.rfind(b'\n') + 1
+        
+        if time.monotonic() - last_sent >= STREAM_KEEPALIVE_INTERVAL:
+            # Comment line; also lets the server notice closed connections
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        
+        time.sleep(STREAM_POLL_INTERVAL)
+
+
+# Stream new alerts to the dashboard as they are logged
+@app.route('/api/alerts/stream')
+def stream_alerts():
+    """
+    Pushes new alerts to the browser over Server-Sent Events, so the
+    dashboard only fetches /api/alerts once instead of polling it.
+    Returns 503 when max_streams are already open; the browser then falls
+    back to polling, leaving server threads free for other requests.
+    """
+    with _streams_lock:
+        if _streams['active'] >= _streams['limit']:
+            return jsonify({'error': 'Too many alert streams, poll /api/alerts instead'}), 503
+        _streams['active'] += 1
+    
+    start = request.headers.get('Last-Event-ID') or request.args.get('offset')
+    try:
+        offset = max(int(start), 0)
+    except (TypeError, ValueError):
+        try:
+            offset = os.path.getsize(ALERTS_LOG)
+        except OSError:
+            offset = 0
+    
+    response = Response(
+        follow_alerts(offset, request.environ.get('waitress.client_disconnected')),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    response.call_on_close(release_stream_slot)
+    return response
+
+
+def release_stream_slot():
+    """Free the slot taken by an alert stream once its response is closed."""
+    with _streams_lock:
+        _streams['active'] -= 1
+
+
 # Serve the dashboard index.html at root
 @app.route('/')
 def serve_dashboard():
@@ -121,14 +284,41 @@ def main():
     
     if config['debug']:
         logger.warning("⚠️  Debug mode is enabled. DO NOT use in production!")
+    elif serve is None:
+        logger.warning("Waitress is not installed, falling back to the Flask development server")
     
-    # Run the Flask app
-    try:
-        app.run(
-            host=config['host'],
-            port=config['port'],
-            debug=config['debug']
+    # Keep at least one waitress thread free of alert streams so the page,
+    # static files and /api/alerts always get served
+    max_streams = config['max_streams']
+    if not config['debug'] and serve is not None and max_streams >= config['threads']:
+        max_streams = max(config['threads'] - 1, 0)
+        logger.warning(
+            f"max_streams ({config['max_streams']}) must be below threads "
+            f"({config['threads']}). Limiting alert streams to {max_streams}."
         )
+    _streams['limit'] = max_streams
+    logger.info(f"Max alert streams: {max_streams}")
+    
+    # Run the Flask app: the development server only in debug mode,
+    # otherwise waitress (each open alert stream occupies one thread)
+    try:
+        if config['debug'] or serve is None:
+            app.run(
+                host=config['host'],
+                port=config['port'],
+                debug=config['debug']
+            )
+        else:
+            logger.info(f"Serving with waitress ({config['threads']} threads)")
+            serve(
+                app,
+                host=config['host'],
+                port=config['port'],
+                threads=config['threads'],
+                # Keeps reading from the socket while a request is running,
+                # so streams learn about closed connections immediately
+                channel_request_lookahead=1
+            )
     except KeyboardInterrupt:
         logger.info("Dashboard shut down by user")
     except Exception as e:
@@ -8,7 +8,11 @@ const state = {
     severityFilter: 'all',
     searchTerm: '',
     refreshInterval: 5000,
-    maxLogEntries: 100
+    maxLogEntries: 100,
+    seenRaw: new Set(),
+    pendingAlerts: [],
+    streamOffset: null,
+    pollTimer: null
 };
 
 function debounce(func, wait) {
@@ -222,6 +226,29 @@ function saveConfiguration() {
     alert('Configuration saved!\n(Note: Restart monitor.py to apply changes)');
 }
 
+function setConnectionStatus(active) {
+    document.getElementById('connection-status').textContent = active ? 'Active' : 'Error';
+    document.querySelector('.status-indicator').classList.toggle('active', active);
+}
+
+function ingestAlerts(newAlerts) {
+    if (state.isPaused) {
+        state.pendingAlerts.push(...newAlerts);
+        return;
+    }
+    
+    newAlerts.forEach(alert => {
+        if (state.seenRaw.has(alert.raw)) return;
+        state.seenRaw.add(alert.raw);
+        state.alerts.push(alert);
+        if (state.currentPage === 'dashboard') {
+            addLogEntry(alert);
+        }
+    });
+    
+    if (state.currentPage === 'dashboard') filterLogs();
+}
+
 async function fetchAlerts() {
     if (state.isPaused) return;
     
@@ -229,29 +256,40 @@ async function fetchAlerts() {
         const response = await fetch('/api/alerts');
         const data = await response.json();
         
-        document.getElementById('connection-status').textContent = 'Active';
-        document.querySelector('.status-indicator').classList.add('active');
-        
-        const newAlerts = (data.alerts || []).map(parseAlert);
-        const existingRaw = new Set(state.alerts.map(a => a.raw));
-        const brandNew = newAlerts.filter(a => !existingRaw.has(a.raw));
-        
-        brandNew.forEach(alert => {
-            state.alerts.push(alert);
-            if (state.currentPage === 'dashboard') {
-                addLogEntry(alert);
-            }
-        });
-        
-        if (state.currentPage === 'dashboard') filterLogs();
+        setConnectionStatus(true);
+        if (state.streamOffset === null) state.streamOffset = data.offset;
+        ingestAlerts((data.alerts || []).map(parseAlert));
         
     } catch (error) {
         console.error('Error:', error);
-        document.getElementById('connection-status').textContent = 'Error';
-        document.querySelector('.status-indicator').classList.remove('active');
+        setConnectionStatus(false);
+    }
+}
+
+function startPolling() {
+    if (state.pollTimer === null) {
+        state.pollTimer = setInterval(fetchAlerts, state.refreshInterval);
     }
 }
 
+// Receive new alerts as they are logged; falls back to polling /api/alerts
+// if the browser or server can't keep an event stream open
+function connectStream() {
+    if (!window.EventSource || state.streamOffset == null) {
+        startPolling();
+        return;
+    }
+    
+    const source = new EventSource(`/api/alerts/stream?offset=${state.streamOffset}`);
+    source.onopen = () => setConnectionStatus(true);
+    source.onmessage = (event) => ingestAlerts([parseAlert(event.data)]);
+    source.onerror = () => {
+        setConnectionStatus(false);
+        // EventSource retries on its own unless the server refused the stream
+        if (source.readyState === EventSource.CLOSED) startPolling();
+    };
+}
+
 function setupEvents() {
     document.querySelectorAll('.nav-item').forEach(item => {
         item.addEventListener('click', (e) => {
@@ -264,6 +302,7 @@ function setupEvents() {
         state.isPaused = !state.isPaused;
         document.getElementById('pause-icon').textContent = state.isPaused ? '▶️' : '⏸️';
         document.getElementById('pause-text').textContent = state.isPaused ? 'Resume' : 'Pause';
+        if (!state.isPaused) ingestAlerts(state.pendingAlerts.splice(0));
     });
     
     document.getElementById('auto-scroll').addEventListener('change', (e) => {
@@ -310,8 +349,7 @@ function setupEvents() {
 function init() {
     console.log('🔍 LogWatcher Dashboard initialized');
     setupEvents();
-    fetchAlerts();
-    setInterval(fetchAlerts, state.refreshInterval);
+    fetchAlerts().then(connectStream);
     setInterval(updateStats, 10000);
 }
 
@@ -7,36 +7,79 @@ Monitors log files for specified keywords and triggers alerts.
 import os
 import sys
 import time
+import re
 import json
+import queue
 import signal
+import argparse
+import atexit
 import logging
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
 # Configuration paths
 CONFIG_PATH = os.path.join('config', 'config.json')
 ALERTS_DIR = 'alerts'
 ALERTS_LOG = os.path.join(ALERTS_DIR, 'alerts.log')
+ALERTS_BUFFER_SIZE = 65536
+ALERTS_FLUSH_INTERVAL = 1.0
+ALERTS_BATCH_SIZE = 256
+
+# Polling intervals (seconds). With watchdog installed the monitor sleeps
+# until the file changes and only falls back to WATCH_TIMEOUT.
+POLL_INTERVAL = 0.5
+WATCH_TIMEOUT = 5
+
+# How often the log path itself is re-stat'ed to detect rotation; between
+# checks only the open descriptor is fstat'ed
+PATH_CHECK_INTERVAL = 1.0
+
+# Bytes requested per read(2) on a monitored log file
+READ_BUFFER_SIZE = 131072
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Global flag for graceful shutdown
 shutdown_requested = False
 
+# Route console alerts through the logging module (--verbose)
+verbose_console = False
+
+# Incidents queued by the monitor threads and written to alerts.log by a
+# single writer thread, started by ensure_alerts_directory()
+_alert_queue = queue.SimpleQueue()
+_alerts_writer = None
+_WRITER_STOP = object()
+
+# Change events of active file watchers, woken on shutdown
+_watch_events = set()
+
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
     global shutdown_requested
     logger.info(f"Received signal {signum}. Shutting down gracefully...")
     shutdown_requested = True
+    for event in list(_watch_events):
+        event.set()
 
 
 def load_config():
@@ -91,26 +134,102 @@ def load_config():
 
 
 def ensure_alerts_directory():
-    """Ensure the alerts directory exists."""
-    Path(ALERTS_DIR).mkdir(parents=True, exist_ok=True)
-    logger.debug(f"Alerts directory ensured: {ALERTS_DIR}")
+    """
+    Ensure the alerts directory exists and start the alerts.log writer.
+    The writer keeps the file open with a large buffer instead of
+    reopening it for every incident. If alerts.log can't be opened the
+    error is logged once and monitoring continues without incident logging.
+    """
+    global _alerts_writer
+    if _alerts_writer is None:
+        try:
+            Path(ALERTS_DIR).mkdir(parents=True, exist_ok=True)
+            logger.debug(f"Alerts directory ensured: {ALERTS_DIR}")
+            alerts_fh = open(ALERTS_LOG, 'a', buffering=ALERTS_BUFFER_SIZE, encoding='utf-8')
+        except OSError as e:
+            logger.error(f"Cannot open alerts log {ALERTS_LOG}: {e}. Incidents will not be logged.")
+            return
+        
+        _alerts_writer = threading.Thread(
+            target=_alerts_writer_loop, args=(alerts_fh,), name='alerts-writer', daemon=True
+        )
+        _alerts_writer.start()
+        atexit.register(stop_alerts_writer)
+
+
+def stop_alerts_writer():
+    """Write any queued incidents, then stop the writer and close alerts.log."""
+    if _alerts_writer is None or not _alerts_writer.is_alive():
+        return
+    _alert_queue.put(_WRITER_STOP)
+    _alerts_writer.join()
+
+
+def _alerts_writer_loop(alerts_fh):
+    """
+    Drain queued incidents into alerts.log, up to ALERTS_BATCH_SIZE per
+    write. The file is flushed when the queue goes quiet and at least every
+    ALERTS_FLUSH_INTERVAL seconds while it is busy.
+    
+    Args:
+        alerts_fh (file): alerts.log opened for appending
+    """
+    last_flush = time.monotonic()
+    stopping = False
+    
+    with alerts_fh:
+        while not stopping:
+            try:
+                item = _alert_queue.get(timeout=ALERTS_FLUSH_INTERVAL)
+            except queue.Empty:
+                item = None
+            
+            batch = []
+            while item is not None:
+                if item is _WRITER_STOP:
+                    stopping = True
+                    break
+                timestamp, severity, file, lineno, line = item
+                batch.append(f"[{timestamp}] [{severity}] {file}:{lineno} {line}\n")
+                if len(batch) >= ALERTS_BATCH_SIZE:
+                    break
+                try:
+                    item = _alert_queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            
+            try:
+                if batch:
+                    alerts_fh.write(''.join(batch))
+                now = time.monotonic()
+                if not batch or stopping or now - last_flush >= ALERTS_FLUSH_INTERVAL:
+                    alerts_fh.flush()
+                    last_flush = now
+            except Exception as e:
+                logger.error(f"Failed to write to alerts log: {e}")
 
 
 def alert_console(severity, line, timestamp):
     """
     Print alert to console.
+    Writes straight to the line-buffered stdout; the logging module (with
+    its record, formatter and handler overhead) is only used with --verbose.
     
     Args:
         severity (str): Alert severity level
         line (str): Log line that triggered the alert
         timestamp (str): Timestamp when alert was triggered
     """
-    logger.info(f"[{severity}] {line.strip()}")
+    if verbose_console:
+        logger.info(f"[{severity}] {line.strip()}")
+    else:
+        sys.stdout.write(f"[{timestamp}] [{severity}] {line}\n")
 
 
 def log_incident(severity, line, timestamp, file, lineno):
     """
     Log incident to alerts.log for later review.
+    The incident is queued and written by the background writer thread.
     
     Args:
         severity (str): Alert severity level
@@ -119,33 +238,138 @@ def log_incident(severity, line, timestamp, file, lineno):
         file (str): Path to the log file
         lineno (int): Line number in the log file
     """
-    try:
-        with open(ALERTS_LOG, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] [{severity}] {file}:{lineno} {line}")
-            if not line.endswith('\n'):
-                f.write('\n')
-    except Exception as e:
-        logger.error(f"Failed to write to alerts log: {e}")
+    if _alerts_writer is None:
+        # alerts.log couldn't be opened; already reported at startup
+        return
+    _alert_queue.put((timestamp, severity, file, lineno, line.rstrip('\n')))
 
 
-def count_file_lines(filepath):
+def build_keyword_matcher(keywords):
     """
-    Safely count the number of lines in a file.
+    Build a function that finds alert keywords in a block of log data.
+    Every backend scans the block once, whatever the number of keywords:
+    an Aho-Corasick automaton (pyahocorasick), a Hyperscan database, or
+    a single compiled regex alternation, in that order of preference.
+    Data is matched as raw bytes so only alerting lines need decoding.
+    
+    Backends differ in which overlapping matches they report, so the
+    keyword that decides a line's severity is picked by scan_chunk():
+    the leftmost match in the line, and the longest one if several start
+    at the same position ('ERROR' beats 'ERR').
     
     Args:
-        filepath (str): Path to the file
+        keywords (dict): Dictionary of keywords and their severity levels
         
     Returns:
-        int: Number of lines in the file
+        callable: Function taking a block of bytes and yielding
+            (start, end, keyword, severity) byte ranges for the matches
     """
-    count = 0
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            for count, _ in enumerate(f, 1):
-                pass
-    except Exception as e:
-        logger.warning(f"Error counting lines in {filepath}: {e}")
-    return count
+    encoded = [(keyword.encode('utf-8'), keyword, severity)
+               for keyword, severity in keywords.items()]
+    
+    if ahocorasick is not None:
+        return _build_ahocorasick_matcher(encoded)
+    if hyperscan is not None:
+        return _build_hyperscan_matcher(encoded)
+    
+    logger.debug("pyahocorasick/hyperscan not installed, using regex matching")
+    # Alternatives are tried in order at each position and finditer() skips
+    # overlapping matches, so list longer keywords first to report the
+    # longest match at each position
+    needles = sorted((needle for needle, _, _ in encoded), key=len, reverse=True)
+    pattern = re.compile(b'|'.join(re.escape(needle) for needle in needles))
+    hits = {needle: (keyword, severity) for needle, keyword, severity in encoded}
+    
+    def find_keywords(data):
+        for found in pattern.finditer(data):
+            yield (found.start(), found.end()) + hits[found.group()]
+    
+    return find_keywords
+
+
+def _build_ahocorasick_matcher(encoded):
+    """Keyword matcher backed by a pyahocorasick automaton."""
+    # The automaton works on str; latin-1 maps every byte to one character,
+    # so matching the latin-1 view of the data is an exact byte match
+    automaton = ahocorasick.Automaton()
+    for needle, keyword, severity in encoded:
+        automaton.add_word(needle.decode('latin-1'), (len(needle), keyword, severity))
+    automaton.make_automaton()
+    
+    def find_keywords(data):
+        # iter() yields (index of the last character, value) for every match
+        for last, (length, keyword, severity) in automaton.iter(data.decode('latin-1')):
+            yield last + 1 - length, last + 1, keyword, severity
+    
+    return find_keywords
+
+
+def _build_hyperscan_matcher(encoded):
+    """Keyword matcher backed by a Hyperscan database."""
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[re.escape(needle) for needle, _, _ in encoded],
+        ids=list(range(len(encoded))),
+        elements=len(encoded),
+        flags=[0] * len(encoded)
+    )
+    hits = [(len(needle), keyword, severity) for needle, keyword, severity in encoded]
+    
+    # Scratch space can't be shared by concurrent scans, so each monitor
+    # thread gets its own
+    local = threading.local()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        # start is only exact with HS_FLAG_SOM_LEFTMOST; keywords are
+        # literals, so derive it from the keyword length instead
+        length, keyword, severity = hits[pattern_id]
+        context.append((end - length, end, keyword, severity))
+    
+    def find_keywords(data):
+        scratch = getattr(local, 'scratch', None)
+        if scratch is None:
+            scratch = local.scratch = hyperscan.Scratch(database)
+        found = []
+        database.scan(data, match_event_handler=on_match, context=found, scratch=scratch)
+        return found
+    
+    return find_keywords
+
+
+def scan_chunk(data, find_keywords):
+    """
+    Find the lines that trigger alerts in a block of complete log lines.
+    The matcher runs over the whole block in one call, so Python code only
+    runs for keyword matches, not for every line read.
+    
+    Args:
+        data (bytes): Log data ending in a newline
+        find_keywords (callable): Keyword matcher from build_keyword_matcher()
+        
+    Returns:
+        list: (line index within the block, severity, line) tuples, one per
+            alerting line. The leftmost match in a line decides its
+            severity, the longest one when several start at the same place.
+    """
+    # Best match per line, keyed by the offset where the line starts
+    best = {}
+    for start, end, _, severity in find_keywords(data):
+        line_start = data.rfind(b'\n', 0, start) + 1
+        rank = (start, start - end)  # leftmost, then longest
+        current = best.get(line_start)
+        if current is None or rank < current[0]:
+            best[line_start] = (rank, severity)
+    
+    alerts = []
+    line_index = 0
+    counted = 0  # Newlines before this offset are included in line_index
+    for line_start in sorted(best):
+        line_index += data.count(b'\n', counted, line_start)
+        counted = line_start
+        line_end = data.find(b'\n', line_start)
+        alerts.append((line_index, best[line_start][1], data[line_start:line_end]))
+    
+    return alerts
 
 
 def get_file_id(filepath):
@@ -168,123 +392,257 @@ def get_file_id(filepath):
         return None
 
 
-def monitor_file(filepath, keywords, alert_methods):
+class LogFileEventHandler(FileSystemEventHandler):
+    """Watchdog handler that signals when a specific log file changes."""
+    
+    def __init__(self, filepath, changed, replaced):
+        super().__init__()
+        self.filepath = os.path.abspath(filepath)
+        self.changed = changed
+        self.replaced = replaced
+    
+    def on_any_event(self, event):
+        paths = (event.src_path, getattr(event, 'dest_path', None))
+        if any(path and os.path.abspath(path) == self.filepath for path in paths):
+            # Created, moved and deleted events mean the file may have been
+            # rotated, so the path needs to be checked again
+            if event.event_type in ('created', 'moved', 'deleted'):
+                self.replaced.set()
+            self.changed.set()
+
+
+def start_file_watcher(filepath):
+    """
+    Start an OS-level watcher (inotify, FSEvents, ReadDirectoryChangesW)
+    on the directory containing a log file.
+    
+    Args:
+        filepath (str): Path to the log file to watch
+        
+    Returns:
+        tuple: (threading.Event set on every change, threading.Event set
+            when the file is created, moved or deleted, Observer), or
+            (None, None, None) if watchdog is unavailable
+    """
+    if Observer is None:
+        logger.debug("watchdog not installed, polling for changes")
+        return None, None, None
+    
+    changed = threading.Event()
+    replaced = threading.Event()
+    observer = Observer()
+    try:
+        directory = os.path.dirname(os.path.abspath(filepath))
+        handler = LogFileEventHandler(filepath, changed, replaced)
+        observer.schedule(handler, directory, recursive=False)
+        observer.start()
+    except Exception as e:
+        logger.warning(f"Could not watch {filepath}, polling for changes instead: {e}")
+        return None, None, None
+    
+    _watch_events.add(changed)
+    return changed, replaced, observer
+
+
+def wait_for_change(changed, timeout):
+    """
+    Block until the watched file changes or the timeout expires.
+    
+    Args:
+        changed (threading.Event): Event from start_file_watcher(), or None to poll
+        timeout (float): Seconds to wait when polling
+    """
+    if changed is None:
+        time.sleep(timeout)
+        return
+    changed.wait(WATCH_TIMEOUT)
+    changed.clear()
+
+
+def monitor_file(filepath, matcher, alert_methods):
     """
     Monitor a log file for new lines containing alert keywords.
     Handles log rotation and truncation by detecting file changes.
     
     Args:
         filepath (str): Path to the log file to monitor
-        keywords (dict): Dictionary of keywords and their severity levels
+        matcher (callable): Keyword matcher from build_keyword_matcher()
         alert_methods (list): List of alert methods to use
     """
     global shutdown_requested
     
     logger.info(f"Starting to monitor: {filepath}")
     
-    file_handle = None
+    fd = None
     current_file_id = None
+    first_open = True
     last_position = 0
+    leftover = b''  # Partial last line, completed by a later read
     lineno = 0
+    next_path_check = 0.0
+    changed, replaced, observer = start_file_watcher(filepath)
+    
+    # Alert timestamps have one-second resolution, so format once per second
+    ts_second = 0
+    ts_text = ''
     
     try:
         while not shutdown_requested:
-            # Check if file exists and get its ID
-            new_file_id = get_file_id(filepath)
-            
-            # Detect file rotation or truncation
-            if new_file_id is None:
-                # File doesn't exist (yet or anymore)
-                if file_handle:
-                    file_handle.close()
-                    file_handle = None
-                    logger.warning(f"Log file disappeared: {filepath}. Waiting for it to reappear...")
-                time.sleep(1)
-                continue
-            
-            # Check if file was rotated (different inode/index) or truncated (smaller size)
             file_rotated = False
             file_truncated = False
             
-            if current_file_id is None:
-                # First time opening the file
-                file_rotated = True
-                logger.info(f"Opening log file: {filepath}")
-            elif new_file_id[0:2] != current_file_id[0:2]:
-                # Different device or inode - file was rotated
-                file_rotated = True
-                logger.info(f"Log rotation detected for {filepath}. Reopening file...")
-            elif new_file_id[2] < current_file_id[2]:
-                # File size decreased - file was truncated
+            # Stat the path (a full path lookup) only every PATH_CHECK_INTERVAL
+            # or when the watcher saw the file replaced; in between, fstat on
+            # the open descriptor is enough to notice truncation
+            if (fd is None or time.monotonic() >= next_path_check
+                    or (replaced is not None and replaced.is_set())):
+                if replaced is not None:
+                    replaced.clear()
+                next_path_check = time.monotonic() + PATH_CHECK_INTERVAL
+                
+                # Check if file exists and get its ID
+                new_file_id = get_file_id(filepath)
+                
+                if new_file_id is None:
+                    # File doesn't exist (yet or anymore)
+                    if fd is not None:
+                        os.close(fd)
+                        fd = None
+                        current_file_id = None
+                        logger.warning(f"Log file disappeared: {filepath}. Waiting for it to reappear...")
+                    wait_for_change(changed, 1)
+                    continue
+                
+                if current_file_id is None:
+                    # First time opening the file
+                    file_rotated = True
+                    logger.info(f"Opening log file: {filepath}")
+                elif new_file_id[0:2] != current_file_id[0:2]:
+                    # Different device or inode - file was rotated
+                    file_rotated = True
+                    logger.info(f"Log rotation detected for {filepath}. Reopening file...")
+                size = new_file_id[2]
+            else:
+                size = os.fstat(fd).st_size
+            
+            if not file_rotated and size < last_position:
+                # File is shorter than what we already read - file was truncated
                 file_truncated = True
-                logger.info(f"Log truncation detected for {filepath}. Reopening file...")
+                logger.info(f"Log truncation detected for {filepath}. Reading from the start...")
             
-            # Reopen file if rotated or truncated
-            if file_rotated or file_truncated:
-                if file_handle:
-                    file_handle.close()
+            if file_rotated:
+                if fd is not None:
+                    os.close(fd)
+                    fd = None
                 
                 try:
-                    file_handle = open(filepath, 'r', encoding='utf-8', errors='ignore')
+                    fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
                     current_file_id = new_file_id
+                    leftover = b''
                     
-                    if file_rotated:
-                        # For rotated files, seek to end to avoid reprocessing
-                        file_handle.seek(0, os.SEEK_END)
-                        last_position = file_handle.tell()
-                        lineno = count_file_lines(filepath)
-                        logger.debug(f"Seeked to end of file (line {lineno})")
+                    if first_open:
+                        # On startup, seek to end to avoid reprocessing old lines.
+                        # Line numbers count from here rather than from the top of
+                        # the file, which would need a full pass to establish.
+                        last_position = os.lseek(fd, 0, os.SEEK_END)
+                        first_open = False
+                        logger.debug(f"Seeked to end of file (offset {last_position})")
                     else:
-                        # For truncated files, start from beginning
-                        file_handle.seek(0)
+                        # A rotated or recreated file is new and usually small;
+                        # read it from the start so nothing written to it before
+                        # the rotation was noticed is lost
                         last_position = 0
-                        lineno = 0
-                        logger.debug(f"Reset to beginning of truncated file")
-                        
+                        logger.debug(f"Reading new file from the start")
+                    lineno = 0
                 except Exception as e:
                     logger.error(f"Error opening {filepath}: {e}")
                     time.sleep(1)
                     continue
+            elif file_truncated:
+                # Same file, so rewind the open descriptor instead of reopening
+                last_position = os.lseek(fd, 0, os.SEEK_SET)
+                leftover = b''
+                lineno = 0
+                logger.debug(f"Reset to beginning of truncated file")
             
-            # Read new lines
-            if file_handle:
-                line = file_handle.readline()
+            # Read new lines, a large block per syscall
+            if fd is not None:
+                chunk = os.read(fd, READ_BUFFER_SIZE)
                 
-                if not line:
+                if not chunk:
                     # No new data, wait and check for rotation
-                    time.sleep(0.5)
+                    wait_for_change(changed, POLL_INTERVAL)
                     continue
                 
-                lineno += 1
-                last_position = file_handle.tell()
+                last_position += len(chunk)
+                data = leftover + chunk
+                cut = data.rfind(b'\n') + 1
+                leftover = data[cut:]
+                if not cut:
+                    continue
+                data = data[:cut]
                 
-                # Check for keywords
-                for keyword, severity in keywords.items():
-                    if keyword in line:
-                        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        
-                        # Trigger alerts based on configured methods
-                        if 'console' in alert_methods:
-                            alert_console(severity, line, timestamp)
-                        
-                        # Always log incidents
-                        log_incident(severity, line, timestamp, filepath, lineno)
-                        
-                        # Only alert once per line (break after first keyword match)
-                        break
+                for index, severity, line in scan_chunk(data, matcher):
+                    text = line.decode('utf-8', errors='ignore').rstrip('\r')
+                    now = int(time.time())
+                    if now != ts_second:
+                        ts_second = now
+                        ts_text = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+                    timestamp = ts_text
+                    
+                    # Trigger alerts based on configured methods
+                    if 'console' in alert_methods:
+                        alert_console(severity, text, timestamp)
+                    
+                    # Always log incidents
+                    log_incident(severity, text, timestamp, filepath, lineno + index + 1)
+                
+                lineno += data.count(b'\n')
                         
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
     except Exception as e:
         logger.error(f"Error monitoring {filepath}: {e}")
     finally:
-        if file_handle:
-            file_handle.close()
+        if fd is not None:
+            os.close(fd)
+        if observer:
+            _watch_events.discard(changed)
+            observer.stop()
+            observer.join()
         logger.info(f"Stopped monitoring: {filepath}")
 
 
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="LogWatcher - monitor log files for alert keywords")
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help="print console alerts through the logger instead of as plain lines"
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main entry point for the log monitor."""
+    global verbose_console
+    args = parse_args()
+    verbose_console = args.verbose
+    
+    # Setup logging here rather than at import time, so importing this
+    # module has no side effects
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    
+    # One write per console alert, flushed at the newline
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=True)
+    
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -306,19 +664,26 @@ def main():
     logger.info(f"Watching for {len(keywords)} keyword(s): {list(keywords.keys())}")
     logger.info(f"Alert methods: {alert_methods}")
     
-    # Monitor log files
-    # Note: Currently monitors files sequentially. For multiple files,
-    # consider using threads or multiprocessing in the future.
+    # Build the keyword matcher once for all monitored files
+    matcher = build_keyword_matcher(keywords)
+    
+    # Monitor each log file in its own thread; the monitors spend nearly
+    # all their time waiting on I/O, so they run concurrently despite the GIL
+    existing_files = []
     for log_file in log_files:
         if os.path.exists(log_file):
-            try:
-                monitor_file(log_file, keywords, alert_methods)
-            except KeyboardInterrupt:
-                logger.info("Keyboard interrupt received")
-                break
+            existing_files.append(log_file)
         else:
             logger.warning(f"Log file not found, skipping: {log_file}")
     
+    if existing_files:
+        with ThreadPoolExecutor(max_workers=len(existing_files)) as executor:
+            futures = [executor.submit(monitor_file, log_file, matcher, alert_methods)
+                       for log_file in existing_files]
+            for future in futures:
+                future.result()
+    
+    stop_alerts_writer()
     logger.info("LogWatcher shut down complete")
 
 